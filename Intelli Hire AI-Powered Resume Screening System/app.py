@@ -5,15 +5,18 @@
 from flask import Flask, render_template, request, jsonify
 from resume_processor import ResumeProcessor
 from rag_engine import RAGEngine
+from rag_cache import RAGCache, DuplicateResumeIndex
 from supabase import create_client
 import os
 from dotenv import load_dotenv
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 load_dotenv()
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+ANALYSIS_WORKERS = 8  # Concurrent Gemini requests per analysis batch
 
 # Configuration
 SUPABASE_URL = os.getenv('SUPABASE_URL')
@@ -30,6 +33,8 @@ if not all([SUPABASE_URL, SUPABASE_KEY, GEMINI_API_KEY]):
 supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 processor = ResumeProcessor()
 rag_engine = RAGEngine(GEMINI_API_KEY)
+analysis_cache = RAGCache()
+duplicate_index = DuplicateResumeIndex()
 
 print("\n" + "="*70)
 print("✅ INTELLI-HIRE RAG SYSTEM STARTED")
@@ -40,6 +45,15 @@ print(f"🎓 Fresher Detection: Enabled")
 print(f"🧮 Advanced Algorithms: Pattern Matching + Similarity Analysis")
 print("="*70 + "\n")
 
+def contact_details(resume_text):
+    """Per-resume contact fields, re-extracted when an analysis is reused"""
+    info = rag_engine.extract_candidate_info(resume_text)
+    return {
+        'candidate_name': info['name'],
+        'email': info['email'],
+        'phone': info['phone']
+    }
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -108,35 +122,28 @@ def analyze_resumes():
         print(f"📄 Resumes to analyze: {len(files)}")
         print(f"{'='*70}")
         
-        results = []
+        # Extract text from all resumes in one parallel batch
+        files = [file for file in files if file.filename]
+        texts = processor.extract_texts(files)
+        resumes = []
         
-        for idx, file in enumerate(files, 1):
-            if not file.filename:
-                continue
-            
+        for idx, (file, resume_text) in enumerate(zip(files, texts), 1):
             print(f"\n[{idx}/{len(files)}] Processing: {file.filename}")
             print("-" * 70)
             
-            # Extract text from resume
-            resume_text = processor.extract_text(file)
-            
             if not resume_text or len(resume_text) < 100:
                 print(f"   ⚠️  Could not extract text or text too short")
                 continue
             
             print(f"   ✅ Text extracted: {len(resume_text)} characters")
-            
-            # Run comprehensive RAG analysis
-            analysis = rag_engine.analyze_with_rag(
-                resume_text,
-                job_data['description'],
-                job_data['required_skills']
-            )
-            
+            resumes.append((file.filename, resume_text))
+        
+        def build_rows(filename, resume_text, analysis):
+            """Database row and API result for one analyzed resume"""
             # Prepare candidate data for database
             candidate_data = {
                 'job_id': job_id,
-                'filename': file.filename,
+                'filename': filename,
                 
                 # Candidate Info
                 'candidate_name': analysis.get('candidate_name', 'Unknown'),
@@ -157,7 +164,7 @@ def analyze_resumes():
                 'cultural_fit_score': analysis.get('cultural_fit_score', 50),
                 
                 # Skills
-                'skills_found': analysis.get('matched_skills', []) + analysis.get('missing_skills', []),
+                'skills_found': sorted(set(analysis.get('matched_skills', [])) | set(analysis.get('missing_skills', []))),
                 'matched_skills': analysis.get('matched_skills', []),
                 'missing_skills': analysis.get('missing_skills', []),
                 
@@ -169,22 +176,82 @@ def analyze_resumes():
                 'suggested_questions': analysis.get('suggested_questions', [])
             }
             
-            # Save to database
-            db_response = supabase.table('candidates').insert(candidate_data).execute()
-            
             # Add complete analysis for response
-            results.append({
+            result = {
                 **candidate_data,
                 'match_details': analysis.get('match_details', []),
                 'detailed_analysis': analysis.get('detailed_analysis', ''),
                 'reasoning': analysis.get('reasoning', ''),
                 'required_skills': job_data['required_skills'],
                 'total_skills_found': analysis.get('total_skills_found', 0)
-            })
+            }
             
-            print(f"   💾 Saved to database")
-            print(f"   📊 Final Score: {analysis['overall_score']}%")
-            print(f"   🎓 Type: {analysis.get('candidate_type', 'Unknown')}")
+            print(f"   📊 {filename}: {analysis['overall_score']}% ({analysis.get('candidate_type', 'Unknown')})")
+            
+            duplicate_index.add(job_id, resume_text, (candidate_data, result))
+            return candidate_data, result
+        
+        def reuse_rows(filename, resume_text, duplicate):
+            """Rows for a duplicate resume, copied from the analyzed original"""
+            candidate_data, result = duplicate
+            print(f"   ♻️  {filename}: duplicate of {candidate_data['filename']} - reusing its analysis")
+            candidate_data = {**candidate_data, **contact_details(resume_text), 'filename': filename}
+            return candidate_data, {**result, **candidate_data}
+        
+        analyzed = [None] * len(resumes)
+        pending = []  # Positions that need a fresh analysis
+        copies = {}  # Position -> pending position of the same resume in this upload
+        upload_index = DuplicateResumeIndex(threshold=duplicate_index.threshold)
+        
+        for idx, (filename, resume_text) in enumerate(resumes):
+            # Same resume already analyzed for this job (re-upload, new format)
+            duplicate = duplicate_index.find(job_id, resume_text)
+            
+            if duplicate:
+                analyzed[idx] = reuse_rows(filename, resume_text, duplicate)
+                continue
+            
+            # Same resume earlier in this upload: analyze it once
+            original = upload_index.find(job_id, resume_text)
+            
+            if original is not None:
+                copies[idx] = original
+                continue
+            
+            # Reuse the analysis of a near-identical resume for this job
+            analysis = analysis_cache.get(resume_text, job_id)
+            
+            if analysis:
+                print(f"   ⚡ {filename}: near-duplicate resume - reusing cached analysis")
+                analysis.update(contact_details(resume_text))
+                analyzed[idx] = build_rows(filename, resume_text, analysis)
+            else:
+                pending.append(idx)
+                upload_index.add(job_id, resume_text, idx)
+        
+        # Run comprehensive RAG analysis for the rest, several candidates per
+        # Gemini request and the requests in flight concurrently
+        if pending:
+            analyses = rag_engine.analyze_batch(
+                [resumes[idx][1] for idx in pending],
+                job_data['description'],
+                job_data['required_skills'],
+                max_workers=ANALYSIS_WORKERS
+            )
+            for idx, analysis in zip(pending, analyses):
+                filename, resume_text = resumes[idx]
+                analysis_cache.put(resume_text, job_id, analysis)
+                analyzed[idx] = build_rows(filename, resume_text, analysis)
+        
+        for idx, original in copies.items():
+            analyzed[idx] = reuse_rows(*resumes[idx], analyzed[original])
+        
+        # Save all candidates in a single round-trip
+        if analyzed:
+            supabase.table('candidates').insert([row for row, _ in analyzed]).execute()
+            print(f"\n💾 Saved {len(analyzed)} candidates to database")
+        
+        results = [result for _, result in analyzed]
         
         # Sort by overall score
         results.sort(key=lambda x: x['overall_score'], reverse=True)
@@ -240,23 +307,23 @@ def get_candidate_details(candidate_id):
 def get_stats():
     """Get system statistics"""
     try:
-        jobs_count = supabase.table('jobs').select('id', count='exact').execute()
-        candidates_count = supabase.table('candidates').select('id', count='exact').execute()
-        
-        # Get fresher vs experienced breakdown
-        all_candidates = supabase.table('candidates').select('is_fresher').execute()
-        freshers = sum(1 for c in all_candidates.data if c.get('is_fresher', False))
-        experienced = len(all_candidates.data) - freshers
-        
-        return jsonify({
-            'success': True,
-            'stats': {
-                'total_jobs': len(jobs_count.data),
-                'total_candidates': len(candidates_count.data),
-                'freshers': freshers,
-                'experienced': experienced
-            }
-        })
+        # Server-side counts: PostgREST returns the total in Content-Range,
+        # so only a single row is ever transferred per query
+        queries = {
+            'total_jobs': supabase.table('jobs').select('id', count='exact'),
+            'total_candidates': supabase.table('candidates').select('id', count='exact'),
+            
+            # Get fresher vs experienced breakdown
+            'freshers': supabase.table('candidates').select('id', count='exact').eq('is_fresher', True),
+            'experienced': supabase.table('candidates').select('id', count='exact').eq('is_fresher', False)
+        }
+        
+        # Independent round-trips - issue them all at once
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            counts = executor.map(lambda query: query.limit(1).execute().count, queries.values())
+            stats = dict(zip(queries.keys(), counts))
+        
+        return jsonify({'success': True, 'stats': stats})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
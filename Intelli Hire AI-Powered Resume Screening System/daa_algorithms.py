@@ -1,11 +1,117 @@
 import numpy as np
+from numba import njit
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
+from collections import deque
 from typing import List, Tuple, Dict
 
+
+# ========== COMPILED DP KERNELS ==========
+# Strings are passed in as arrays of character codes so Numba can compile
+# the inner loops to machine code. Both kernels keep only two DP rows.
+
+def _char_codes(text: str) -> np.ndarray:
+    """Character codes of text (UTF-32 keeps one element per character)"""
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+
+@njit(cache=True, boundscheck=False)
+def _edit_distance_nb(s1, s2):
+    m, n = s1.shape[0], s2.shape[0]
+    prev = np.empty(n + 1, np.int32)
+    curr = np.empty(n + 1, np.int32)
+    
+    for j in range(n + 1):
+        prev[j] = j
+    
+    for i in range(1, m + 1):
+        curr[0] = i
+        c = s1[i - 1]
+        for j in range(1, n + 1):
+            if c == s2[j - 1]:
+                curr[j] = prev[j - 1]
+            else:
+                best = prev[j]
+                if curr[j - 1] < best:
+                    best = curr[j - 1]
+                if prev[j - 1] < best:
+                    best = prev[j - 1]
+                curr[j] = best + 1
+        prev, curr = curr, prev
+    
+    return prev[n]
+
+
+@njit(cache=True, boundscheck=False)
+def _lcs_nb(s1, s2):
+    m, n = s1.shape[0], s2.shape[0]
+    prev = np.zeros(n + 1, np.int32)
+    curr = np.zeros(n + 1, np.int32)
+    
+    for i in range(1, m + 1):
+        c = s1[i - 1]
+        for j in range(1, n + 1):
+            if c == s2[j - 1]:
+                curr[j] = prev[j - 1] + 1
+            elif prev[j] >= curr[j - 1]:
+                curr[j] = prev[j]
+            else:
+                curr[j] = curr[j - 1]
+        prev, curr = curr, prev
+    
+    return prev[n]
+
+
+@njit(cache=True, boundscheck=False)
+def _myers_edit_distance_nb(a, b):
+    # Myers/Hyyrö bit-parallel Levenshtein: one uint64 holds the vertical
+    # deltas of a whole DP column, so pattern a must be at most 64 chars
+    m = a.shape[0]
+    if m == 0:
+        return b.shape[0]
+    
+    one = np.uint64(1)
+    peq = np.zeros(256, np.uint64)
+    for i in range(m):
+        peq[a[i]] |= one << np.uint64(i)
+    
+    pv = ~np.uint64(0)
+    mv = np.uint64(0)
+    last = one << np.uint64(m - 1)
+    score = m
+    
+    for j in range(b.shape[0]):
+        eq = peq[b[j]]
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        
+        ph = (ph << one) | one
+        mh = mh << one
+        pv = mh | ~(xv | ph)
+        mv = ph & xv
+    
+    return score
+
+
+# Warm-compile at import so the first /api/analyze request pays no JIT cost
+_edit_distance_nb(_char_codes("warm"), _char_codes("up"))
+_lcs_nb(_char_codes("warm"), _char_codes("up"))
+_myers_edit_distance_nb(np.frombuffer(b"warm", np.uint8), np.frombuffer(b"up", np.uint8))
+
+
 class DAAAlgorithms:
     """
     Implementation of DAA concepts:
     1. Dynamic Programming - Edit Distance (Levenshtein)
     2. String Matching - KMP Algorithm
+    3. Multi-Pattern Matching - Aho-Corasick Automaton
     """
     
     # ========== DYNAMIC PROGRAMMING ==========
@@ -19,7 +125,12 @@ class DAAAlgorithms:
                  to transform str1 into str2
         
         Time Complexity: O(m × n)
-        Space Complexity: O(m × n) can be optimized to O(min(m,n))
+        Space Complexity: O(min(m, n)) - only two DP rows are kept
+        
+        Compiled with Numba: the DP loop runs as machine code over
+        character codes instead of interpreting one Python step per cell.
+        ASCII strings where the shorter one fits in 64 chars use Myers'
+        bit-parallel algorithm instead - a whole DP column per step, O(n).
         
         Example:
         edit_distance("kitten", "sitting") = 3
@@ -27,30 +138,17 @@ class DAAAlgorithms:
         - sitten → sittin (substitute e→i)
         - sittin → sitting (insert g)
         """
-        m, n = len(str1), len(str2)
+        # Size the rolling DP rows (or the bit-vector) by the shorter string
+        if len(str2) > len(str1):
+            str1, str2 = str2, str1
         
-        # Create DP table
-        dp = [[0] * (n + 1) for _ in range(m + 1)]
+        if len(str2) <= 64 and str1.isascii() and str2.isascii():
+            return int(_myers_edit_distance_nb(
+                np.frombuffer(str2.encode('ascii'), np.uint8),
+                np.frombuffer(str1.encode('ascii'), np.uint8)
+            ))
         
-        # Base cases
-        for i in range(m + 1):
-            dp[i][0] = i  # Delete all characters from str1
-        for j in range(n + 1):
-            dp[0][j] = j  # Insert all characters to str1
-        
-        # Fill DP table
-        for i in range(1, m + 1):
-            for j in range(1, n + 1):
-                if str1[i-1] == str2[j-1]:
-                    dp[i][j] = dp[i-1][j-1]  # No operation needed
-                else:
-                    dp[i][j] = 1 + min(
-                        dp[i-1][j],      # Delete from str1
-                        dp[i][j-1],      # Insert to str1
-                        dp[i-1][j-1]     # Replace in str1
-                    )
-        
-        return dp[m][n]
+        return int(_edit_distance_nb(_char_codes(str1), _char_codes(str2)))
     
     @staticmethod
     def similarity_score(str1: str, str2: str) -> float:
@@ -58,15 +156,11 @@ class DAAAlgorithms:
         Convert edit distance to similarity score (0-100%)
         
         Formula: similarity = (1 - distance/max_length) × 100
-        """
-        str1, str2 = str1.lower(), str2.lower()
-        distance = DAAAlgorithms.edit_distance(str1, str2)
-        max_len = max(len(str1), len(str2))
         
-        if max_len == 0:
-            return 100.0
-        
-        similarity = (1 - distance / max_len) * 100
+        The distance comes from rapidfuzz's bit-parallel (Myers) Levenshtein
+        in C - same result as edit_distance, without the O(m × n) table.
+        """
+        similarity = Levenshtein.normalized_similarity(str1.lower(), str2.lower()) * 100
         return round(similarity, 2)
     
     # ========== STRING MATCHING ==========
@@ -137,6 +231,89 @@ class DAAAlgorithms:
         
         return matches
     
+    @staticmethod
+    def build_aho_corasick(patterns: List[str]) -> Tuple:
+        """
+        Aho-Corasick automaton construction
+        
+        Concept: A trie of all patterns plus failure links (the KMP failure
+                 function generalised to many patterns), so one scan of
+                 the text finds every pattern
+        
+        Time Complexity: O(total pattern length)
+        
+        Patterns are lowercased; the automaton is reusable for any number
+        of texts.
+        
+        Returns: (goto, fail, output, lengths) for aho_corasick_search
+        """
+        goto: List[Dict[str, int]] = [{}]
+        fail: List[int] = [0]
+        output: List[List[int]] = [[]]
+        lengths = []
+        
+        # Build trie of patterns
+        for idx, pattern in enumerate(patterns):
+            pattern = pattern.lower()
+            lengths.append(len(pattern))
+            if not pattern:
+                continue
+            
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    output.append([])
+                state = nxt
+            output[state].append(idx)
+        
+        # Build failure links breadth-first (depth-1 states fail to root)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                output[nxt] = output[nxt] + output[fail[nxt]]
+        
+        return goto, fail, output, lengths
+    
+    @staticmethod
+    def aho_corasick_search(automaton: Tuple, text: str) -> List[Tuple[int, int]]:
+        """
+        Scan text once with an automaton from build_aho_corasick
+        
+        Time Complexity: O(n + z) where n=text length, z=number of matches
+        
+        Patterns were lowercased at build time, so pass lowercase text -
+        callers scanning one resume many times lowercase it once.
+        
+        Returns: List of (start_index, pattern_index) for every occurrence
+        
+        Example:
+        aho_corasick_search(build_aho_corasick(["he", "she"]), "ushers")
+        → [(1, 1), (2, 0)]
+        """
+        goto, fail, output, lengths = automaton
+        matches = []
+        state = 0
+        
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for idx in output[state]:
+                matches.append((i - lengths[idx] + 1, idx))
+        
+        return matches
+    
     @staticmethod
     def fuzzy_skill_match(resume_skills: List[str], required_skill: str, 
                          threshold: float = 70.0) -> Tuple[bool, str, float]:
@@ -150,42 +327,65 @@ class DAAAlgorithms:
         Returns: (is_match, matched_skill, similarity_score)
         """
         required_skill = required_skill.lower().strip()
+        resume_skills = [skill.lower().strip() for skill in resume_skills]
         
+        # Method 1: Exact substring match using KMP
         for resume_skill in resume_skills:
-            resume_skill = resume_skill.lower().strip()
-            
-            # Method 1: Exact substring match using KMP
             if DAAAlgorithms.kmp_search(resume_skill, required_skill):
                 return True, resume_skill, 100.0
             
             if DAAAlgorithms.kmp_search(required_skill, resume_skill):
                 return True, resume_skill, 100.0
-            
-            # Method 2: Fuzzy match using Edit Distance
-            similarity = DAAAlgorithms.similarity_score(resume_skill, required_skill)
-            if similarity >= threshold:
-                return True, resume_skill, similarity
+        
+        # Method 2: Fuzzy match using Edit Distance - one C call scores
+        # every resume skill and keeps the best one above the threshold
+        best = process.extractOne(
+            required_skill, resume_skills,
+            scorer=Levenshtein.normalized_similarity,
+            score_cutoff=threshold / 100
+        )
+        if best:
+            resume_skill, similarity, _ = best
+            return True, resume_skill, round(similarity * 100, 2)
         
         return False, "", 0.0
     
+    @staticmethod
+    def similarity_matrix(strings1: List[str], strings2: List[str],
+                          score_cutoff: float = 0.0, workers: int = 1) -> np.ndarray:
+        """
+        Pairwise similarity scores (0-100%) between two string lists
+        
+        Same formula as similarity_score, computed for every pair in one
+        rapidfuzz call instead of len1 × len2 Python calls.
+        Pairs scoring below score_cutoff come back as 0; knowing the bound
+        lets rapidfuzz stop each comparison early.
+        
+        workers: rapidfuzz threads (-1 = all cores). Starting threads costs
+        more than scoring a few skills, so only large matrices want > 1.
+        
+        Returns: float32 matrix of shape (len(strings1), len(strings2))
+        """
+        return process.cdist(
+            [s.lower().strip() for s in strings1],
+            [s.lower().strip() for s in strings2],
+            scorer=Levenshtein.normalized_similarity,
+            score_cutoff=score_cutoff / 100,
+            workers=workers
+        ) * 100
+    
     @staticmethod
     def longest_common_subsequence(str1: str, str2: str) -> int:
         """
         LCS using Dynamic Programming
         
         Time Complexity: O(m × n)
-        Space Complexity: O(m × n)
+        Space Complexity: O(min(m, n)) - only two DP rows are kept
         
         Used for measuring text similarity
         """
-        m, n = len(str1), len(str2)
-        dp = [[0] * (n + 1) for _ in range(m + 1)]
-        
-        for i in range(1, m + 1):
-            for j in range(1, n + 1):
-                if str1[i-1] == str2[j-1]:
-                    dp[i][j] = dp[i-1][j-1] + 1
-                else:
-                    dp[i][j] = max(dp[i-1][j], dp[i][j-1])
+        # Size the rolling DP rows by the shorter string
+        if len(str2) > len(str1):
+            str1, str2 = str2, str1
         
-        return dp[m][n]
\ No newline at end of file
+        return int(_lcs_nb(_char_codes(str1), _char_codes(str2)))
\ No newline at end of file
@@ -1,7 +1,45 @@
 import google.generativeai as genai
+import diskcache
+import hashlib
 import json
-import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+from typing_extensions import TypedDict
+
+CACHE_DIR = '.llm_cache'
+CACHE_TTL = 7 * 86400  # 7 days
+
+class EducationSchema(TypedDict):
+    highest_degree: str
+    institution: str
+    field: str
+
+class AnalysisSchema(TypedDict):
+    """Shape of analyze_resume output, enforced by Gemini's JSON mode"""
+    candidate_name: str
+    email: Optional[str]
+    phone: Optional[str]
+    experience_years: float
+    education: EducationSchema
+    overall_score: float
+    skill_match_score: float
+    experience_match_score: float
+    cultural_fit_score: float
+    skills_found: List[str]
+    matched_skills: List[str]
+    missing_skills: List[str]
+    strengths: List[str]
+    weaknesses: List[str]
+    ai_summary: str
+    recommendation: str
+    reasoning: str
+    suggested_questions: List[str]
+
+# Built once and shared by every analyze_resume call
+ANALYSIS_CONFIG = genai.GenerationConfig(
+    response_mime_type='application/json',
+    response_schema=AnalysisSchema,
+    temperature=0.2
+)
 
 class GenAIAnalyzer:
     def __init__(self, api_key: str):
@@ -9,8 +47,17 @@ class GenAIAnalyzer:
         Initialize Gemini AI
         Get free API key from: https://makersuite.google.com/app/apikey
         """
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-pro')
+        # Same transport as RAGEngine - one keep-alive session for all calls
+        genai.configure(api_key=api_key, transport='rest')
+        self.model = genai.GenerativeModel('gemini-2.0-flash')  # gemini-pro has no schema-constrained output
+        
+        # Disk-backed LRU of model responses, shared across restarts
+        self._cache = diskcache.Cache(CACHE_DIR, size_limit=2**30)
+    
+    @staticmethod
+    def _cache_key(prompt: str) -> str:
+        """Content hash of the full prompt"""
+        return hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
     
     def analyze_resume(self, resume_text: str, job_description: str, 
                       required_skills: List[str]) -> Dict[str, Any]:
@@ -83,21 +130,20 @@ Be thorough, honest, and professional. Consider:
 - Red flags (gaps, job hopping, inconsistencies)
 """
         
+        key = self._cache_key(prompt)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            # Generate response from Gemini
-            response = self.model.generate_content(prompt)
+            # Generate response from Gemini (schema-constrained JSON)
+            response = self.model.generate_content(prompt, generation_config=ANALYSIS_CONFIG)
             result_text = response.text
             
-            # Extract JSON from response (handle markdown code blocks)
-            json_match = re.search(r'```json\s*(.*?)\s*```', result_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-            else:
-                json_str = result_text
-            
             # Parse JSON
-            analysis = json.loads(json_str)
+            analysis = json.loads(result_text)
             
+            self._cache.set(key, analysis, expire=CACHE_TTL)
             return analysis
             
         except json.JSONDecodeError as e:
@@ -150,8 +196,14 @@ Provide:
 Keep response concise and actionable.
 """
         
+        key = self._cache_key(prompt)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
             response = self.model.generate_content(prompt)
+            self._cache.set(key, response.text, expire=CACHE_TTL)
             return response.text
         except Exception as e:
             return f"Comparison failed: {str(e)}"
\ No newline at end of file
@@ -0,0 +1,198 @@
+# ============================================================================
+# RAG CACHE - Approximate cache for analysis results (SimHash)
+# ============================================================================
+
+import copy
+import hashlib
+import re
+import threading
+import zlib
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def simhash64(text: str, shingle_size: int = 3) -> int:
+    """
+    64-bit SimHash fingerprint of text
+    
+    Concept: Each word shingle is hashed to 64 bits; every bit position
+             votes +1/-1 across all shingles and the sign of the vote
+             becomes the fingerprint bit. Near-identical texts get
+             fingerprints that differ in only a few bits.
+    
+    Time Complexity: O(n) where n=number of tokens
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return 0
+    
+    shingles = [
+        ' '.join(tokens[i:i + shingle_size])
+        for i in range(max(1, len(tokens) - shingle_size + 1))
+    ]
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), 'little')
+         for s in shingles],
+        dtype=np.uint64
+    )
+    
+    # One row of 64 bits per shingle; vote on all bit positions at once
+    bits = np.unpackbits(hashes.view(np.uint8)).reshape(-1, 64)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(shingles)
+    
+    return int.from_bytes(np.packbits(votes > 0).tobytes(), 'little')
+
+
+class RAGCache:
+    """
+    LRU cache of analyze_with_rag results keyed by (job_id, SimHash)
+    
+    A lookup hits when a stored fingerprint for the same job is within
+    `tolerance` bits (Hamming distance) of the resume's fingerprint, so
+    re-uploads and lightly edited resumes skip the whole RAG pipeline.
+    """
+    
+    def __init__(self, max_entries: int = 1024, tolerance: int = 6):
+        self.max_entries = max_entries
+        self.tolerance = tolerance
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, resume_text: str, job_id: Any) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached analysis for a near-identical resume"""
+        fingerprint = simhash64(resume_text)
+        
+        with self._lock:
+            for key in self._entries:
+                cached_job_id, cached_fingerprint = key
+                if cached_job_id == job_id and \
+                   (cached_fingerprint ^ fingerprint).bit_count() <= self.tolerance:
+                    self._entries.move_to_end(key)
+                    return copy.deepcopy(self._entries[key])
+        
+        return None
+    
+    def put(self, resume_text: str, job_id: Any, analysis: Dict[str, Any]) -> None:
+        """Store an analysis, evicting the least recently used entry if full"""
+        key = (job_id, simhash64(resume_text))
+        
+        with self._lock:
+            self._entries[key] = copy.deepcopy(analysis)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+# ============================================================================
+# DUPLICATE DETECTION - MinHash + Locality Sensitive Hashing
+# ============================================================================
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class MinHashLSH:
+    """
+    MinHash signatures with banded LSH lookup
+    
+    Concept: The fraction of equal MinHash values between two signatures
+             estimates the Jaccard similarity of their shingle sets. The
+             signature is split into bands; texts sharing any whole band
+             land in the same bucket, so a lookup only compares against
+             likely duplicates instead of every stored text.
+    
+    With 8 bands of 16 rows the bucket collision curve rises sharply
+    around Jaccard 0.88; candidates are then checked against `threshold`.
+    """
+    
+    def __init__(self, threshold: float = 0.9, num_perm: int = 128,
+                 bands: int = 8, shingle_size: int = 5, seed: int = 1):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        
+        # Random hash permutations h(x) = (a*x + b) mod p
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        
+        self._buckets = [defaultdict(list) for _ in range(bands)]
+        self._signatures: Dict[Any, np.ndarray] = {}
+    
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of the character shingles of text"""
+        text = ' '.join(text.lower().split())
+        k = self.shingle_size
+        shingles = {text[i:i + k] for i in range(max(1, len(text) - k + 1))}
+        hashes = np.array([zlib.crc32(s.encode()) for s in shingles], dtype=np.uint64)
+        
+        # (num_perm × num_shingles) permuted hashes, min per permutation
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        
+        # Values are masked to 32 bits, so uint32 storage is lossless and
+        # halves the memory held per indexed resume
+        return (permuted & _MAX_HASH).min(axis=1).astype(np.uint32)
+    
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+    
+    def insert(self, key: Any, signature: np.ndarray) -> None:
+        self._signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band][band_key].append(key)
+    
+    def query(self, signature: np.ndarray) -> Optional[Any]:
+        """Key of the most similar stored text with Jaccard >= threshold"""
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        
+        best_key, best_jaccard = None, self.threshold
+        for key in candidates:
+            jaccard = float(np.mean(self._signatures[key] == signature))
+            if jaccard >= best_jaccard:
+                best_key, best_jaccard = key, jaccard
+        
+        return best_key
+
+
+class DuplicateResumeIndex:
+    """
+    Per-job index of analyzed resumes for spotting re-uploads
+    
+    Keeps one MinHashLSH per job (most recent `max_jobs` jobs) and maps
+    each stored resume to the value it was analyzed into.
+    """
+    
+    def __init__(self, threshold: float = 0.9, max_jobs: int = 64):
+        self.threshold = threshold
+        self.max_jobs = max_jobs
+        self._jobs: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _index(self, job_id: Any) -> Dict[str, Any]:
+        if job_id not in self._jobs:
+            self._jobs[job_id] = {'lsh': MinHashLSH(threshold=self.threshold), 'values': []}
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        self._jobs.move_to_end(job_id)
+        return self._jobs[job_id]
+    
+    def find(self, job_id: Any, resume_text: str) -> Optional[Any]:
+        """Value stored for a near-duplicate of resume_text in this job"""
+        with self._lock:
+            index = self._index(job_id)
+            key = index['lsh'].query(index['lsh'].signature(resume_text))
+            return None if key is None else index['values'][key]
+    
+    def add(self, job_id: Any, resume_text: str, value: Any) -> None:
+        with self._lock:
+            index = self._index(job_id)
+            index['lsh'].insert(len(index['values']), index['lsh'].signature(resume_text))
+            index['values'].append(value)
\ No newline at end of file
@@ -3,19 +3,336 @@
 # ============================================================================
 
 import google.generativeai as genai
-from typing import List, Dict, Any
+import numpy as np
+from typing import List, Dict, Any, Optional, Tuple
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import json
 import re
 from datetime import datetime
+from daa_algorithms import DAAAlgorithms
+
+LLM_BATCH_SIZE = 5  # Candidates per multi-candidate Gemini request
+LLM_TOKENS_PER_CANDIDATE = 1024  # Output budget per analysis in a multi-candidate reply
+SKILL_MATCH_THRESHOLD = 60.0  # Minimum similarity (%) for a skill to count as matched
+PRESCREEN_SKILL_MATCH = 15.0  # Below this skill match (%), no experience + senior role skips the LLM
+SENIOR_ROLE_YEARS = 5  # Years of experience asked for that make a role senior
+
+# ============================================================================
+# COMPILED PATTERNS - compiled once at import, not looked up per resume
+# ============================================================================
+
+_NAME_RE = re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})\b')
+# Local part and domain are capped at their RFC lengths (64 / 253): unbounded
+# `+` runs made a long unbroken token cost quadratic time to reject
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,253}\.[A-Z|a-z]{2,}\b')
+_PHONE_RES = (
+    re.compile(r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),
+    re.compile(r'\b\d{10}\b'),
+)
+_PHONE_RUN_RE = re.compile(r'[+\d][\d()+\-.\s]*')  # Stretch of the characters a phone number uses
+
+# Header word -> the resume section it opens
+_SECTION_HEADERS = {
+    'education': 'education',
+    'academic': 'education',
+    'qualification': 'education',
+    'qualifications': 'education',
+    'experience': 'experience',
+    'skills': 'skills',
+    'projects': 'projects',
+    'internship': 'internship',
+    'internships': 'internship',
+}
+_HEADER_WORD = r'(education|academic|qualifications?|experience|skills|projects|internships?)'
+# Header word after optional bullets/icons and up to 3 qualifying words
+# ("WORK EXPERIENCE", "• EDUCATION"). Header words joined on to it
+# ("ACADEMIC PROJECTS", "EDUCATION & QUALIFICATIONS") are captured in
+# group 2, and the last of them names the section
+_SECTION_HEADER_RE = re.compile(
+    r'^\W*(?:[a-z&]+\s+){0,3}?' + _HEADER_WORD +
+    r'(?:\s+(?:(?:&|and)\s+)?' + _HEADER_WORD + r')*\b',
+    re.IGNORECASE
+)
+MAX_HEADER_WORDS = 5  # Longer lines only count as headers if they start with the header word
+
+_DEGREE_RE = re.compile(
+    r'\b(B\.?Tech|B\.?E\.?|M\.?Tech|M\.?E\.?|MBA|MS|PhD|Bachelor|Master|BSc|MSc|BCA|MCA|B\.Sc|M\.Sc)[^\n]{0,100}',
+    re.IGNORECASE
+)
+_YEAR_RE = re.compile(r'\b(20[0-2]\d|2030)\b')  # Graduation years 2000-2030
+# "5 years experience". The count is at most 3 digits and must start a digit
+# run - a bare `\d+` retried from every digit of a long number (quadratic),
+# and anything over 3 digits is beyond the accepted 0-50 range anyway
+_EXP_PATTERN = r'(?<!\d)(?P<exp_years>\d{1,3})\+?\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)'
+
+_SKILL_PATTERNS = {
+    'python': r'\bpython\b',
+    'java': r'\bjava\b',
+    'javascript': r'\b(?:javascript|js)\b',
+    'typescript': r'\btypescript\b',
+    'c++': r'\bc\+\+\b',
+    'c#': r'\bc#\b',
+    'go': r'\b(?:golang|go)\b',
+    'rust': r'\brust\b',
+    'ruby': r'\bruby\b',
+    'php': r'\bphp\b',
+    'html': r'\bhtml\b',
+    'css': r'\bcss\b',
+    'react': r'\breact\b',
+    'angular': r'\bangular\b',
+    'vue': r'\bvue\b',
+    'node': r'\bnode\b',
+    'express': r'\bexpress\b',
+    'django': r'\bdjango\b',
+    'flask': r'\bflask\b',
+    'spring': r'\bspring\b',
+    'sql': r'\bsql\b',
+    'mysql': r'\bmysql\b',
+    'postgresql': r'\bpostgresql\b',
+    'mongodb': r'\bmongodb\b',
+    'redis': r'\bredis\b',
+    'aws': r'\baws\b',
+    'azure': r'\bazure\b',
+    'gcp': r'\bgcp\b',
+    'docker': r'\bdocker\b',
+    'kubernetes': r'\bkubernetes\b',
+    'jenkins': r'\bjenkins\b',
+    'machine learning': r'\b(?:machine[-\s]learning|ml)\b',
+    'deep learning': r'\b(?:deep[-\s]learning|dl)\b',
+    'nlp': r'\bnlp\b',
+    'tensorflow': r'\btensorflow\b',
+    'pytorch': r'\bpytorch\b',
+    'git': r'\bgit\b',
+    'github': r'\bgithub\b',
+    'jira': r'\bjira\b',
+    'agile': r'\bagile\b',
+    'rest api': r'\brest\b',
+    'graphql': r'\bgraphql\b',
+    'microservices': r'\bmicroservices\b',
+    'numpy': r'\bnumpy\b',
+    'pandas': r'\bpandas\b',
+    'data structures': r'\bdata structures\b',
+    'problem solving': r'\bproblem[-\s]solving\b',
+    'communication skills': r'\bcommunication\b',
+}
+
+# Experience mentions and all skill patterns fused into one alternation, so
+# the lowercase resume is scanned once instead of once per pattern; the named
+# group that matched says what was found. Experience matches start with a
+# digit and skills with a letter, and neither contains the other's words, so
+# fusing them never hides a match.
+_SKILL_GROUPS = {f's{i}': skill_name for i, skill_name in enumerate(_SKILL_PATTERNS)}
+_LOWERCASE_SCAN_RE = re.compile('|'.join(
+    [f'(?P<exp>{_EXP_PATTERN})'] +
+    [f'(?P<{group}>{_SKILL_PATTERNS[skill_name]})' for group, skill_name in _SKILL_GROUPS.items()]
+))
+
+# Seniority wording in a job description. "Lead" only counts as part of a
+# title ("tech lead", "lead engineer"), not as a verb ("must lead projects")
+_SENIOR_TITLE_RE = re.compile(
+    r'\b(?:senior|sr|principal|staff\s+engineer|architect|head\s+of'
+    r'|(?:tech|technical|team|engineering)\s+lead'
+    r'|lead\s+(?:engineer|developer|architect|scientist|analyst|designer))\b',
+    re.IGNORECASE
+)
+# Years asked for, "5+ years" or "3-5 years"; group 1 is the lower bound
+_YEARS_REQUIRED_RE = re.compile(
+    r'(?<!\d)(\d{1,2})(?:\s*\+|\s*(?:-|–|to)\s*\d{1,2})?\s*(?:years|yrs)\b',
+    re.IGNORECASE
+)
+_CODE_BLOCK_RE = re.compile(r'```(?:json)?\s*(.*?)\s*```', re.DOTALL)
+
+@lru_cache(maxsize=64)
+def _lowercase(text: str) -> str:
+    """Lowercased resume text, made once and shared by every scan of it"""
+    return text.lower()
+
+def _split_sections(resume_text: str) -> Dict[str, str]:
+    """
+    Resume text grouped by section in a single pass over its lines
+    
+    A header line opens its section and keeps any text after the header
+    ("Education: B.Tech ..."); the section runs until the next header.
+    A header is a short line with a header word among its first few words,
+    or any line that starts with one. Text before the first header belongs
+    to no section.
+    """
+    sections: Dict[str, List[str]] = {}
+    current = None
+    
+    for line in resume_text.splitlines():
+        stripped = line.strip()
+        header = _SECTION_HEADER_RE.match(stripped)
+        
+        if header and (header.start(1) == 0 or len(stripped.split()) <= MAX_HEADER_WORDS):
+            current = _SECTION_HEADERS[(header.group(2) or header.group(1)).lower()]
+            line = stripped[header.end():]
+        
+        if current:
+            sections.setdefault(current, []).append(line)
+    
+    return {name: '\n'.join(lines) for name, lines in sections.items()}
+
+def _find_phone(resume_text: str) -> Optional[str]:
+    """
+    First phone number in the resume, by the _PHONE_RES patterns in order
+    
+    The patterns are only tried on runs of phone characters holding at
+    least 10 digits, instead of at every position of the resume. A run is
+    searched with one character of context on each side, so word
+    boundaries behave as in a full-text search.
+    """
+    runs = [run for run in _PHONE_RUN_RE.finditer(resume_text)
+            if sum(map(str.isdigit, run.group())) >= 10]
+    
+    for pattern in _PHONE_RES:
+        for run in runs:
+            phone_match = pattern.search(resume_text, run.start(), run.end() + 1)
+            if phone_match:
+                return phone_match.group(0)
+    
+    return None
+
+@lru_cache(maxsize=1024)
+def _scan_lowercase(text: str) -> Tuple[Tuple[str, ...], Tuple[int, ...]]:
+    """Skills and stated years of experience, from one pass over the lowercase text"""
+    found_skills = set()
+    experience_years = []
+    
+    for match in _LOWERCASE_SCAN_RE.finditer(_lowercase(text)):
+        if match.lastgroup == 'exp':
+            experience_years.append(int(match.group('exp_years')))
+        else:
+            found_skills.add(_SKILL_GROUPS[match.lastgroup])
+    
+    return tuple(found_skills), tuple(experience_years)
+
+def _find_json(text: str, opener: str = '{') -> Optional[str]:
+    """
+    Outermost balanced {...} (or [...]) span in LLM output, in one linear scan
+    
+    A stack of open positions tracks nesting; quotes only count inside a
+    span, so brackets within JSON strings (escapes included) are skipped
+    while stray quotes in surrounding prose are not. If the first opener is
+    never closed, the earliest complete span found is returned.
+    """
+    closer = '}' if opener == '{' else ']'
+    stack = []
+    best = None
+    in_string = escaped = False
+    
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == opener:
+            stack.append(i)
+        elif not stack:
+            continue
+        elif ch == '"':
+            in_string = True
+        elif ch == closer:
+            start = stack.pop()
+            if not stack:
+                return text[start:i + 1]
+            if best is None or start < best[0]:
+                best = (start, i + 1)
+    
+    return text[best[0]:best[1]] if best else None
+
+# ============================================================================
+# PER-JOB CONTEXT - depends only on the job, so it is built once per job
+# and reused for every resume in the batch (edits change the key)
+# ============================================================================
+
+@lru_cache(maxsize=64)
+def _skill_automaton(skills_lower: Tuple[str, ...]) -> Tuple:
+    """Aho-Corasick automaton over a job's required skills"""
+    return DAAAlgorithms.build_aho_corasick(list(skills_lower))
+
+@lru_cache(maxsize=4096)
+def _skill_similarities(skills_lower: Tuple[str, ...], resume_skill: str) -> np.ndarray:
+    """
+    Similarity of one resume skill to each of a job's required skills
+    
+    Resume skills come from a small shared vocabulary, so across a batch the
+    same (job, skill) column is needed over and over; it is computed once.
+    """
+    # Scores are rounded to 2 decimals before the threshold check, so keep
+    # anything that could still round up to it
+    return DAAAlgorithms.similarity_matrix(
+        list(skills_lower), [resume_skill], score_cutoff=SKILL_MATCH_THRESHOLD - 0.005
+    )[:, 0]
+
+@lru_cache(maxsize=4096)
+def _skill_containment(skills_lower: Tuple[str, ...], resume_skill: str) -> Tuple[int, ...]:
+    """Indices of the required skills inside, or containing, one resume skill"""
+    found = {idx for _, idx in DAAAlgorithms.aho_corasick_search(_skill_automaton(skills_lower), resume_skill)}
+    found.update(idx for idx, skill in enumerate(skills_lower) if resume_skill in skill)
+    return tuple(sorted(found))
+
+@lru_cache(maxsize=64)
+def _is_senior_role(job_description: str) -> bool:
+    """Whether the job description asks for a senior / experienced hire"""
+    if _SENIOR_TITLE_RE.search(job_description):
+        return True
+    return any(int(years) >= SENIOR_ROLE_YEARS for years in _YEARS_REQUIRED_RE.findall(job_description))
+
+@lru_cache(maxsize=64)
+def _job_prompt_prefix(job_description: str, required_skills: Tuple[str, ...]) -> str:
+    """
+    Fixed job section that starts every candidate prompt for this job
+    
+    Worded for one candidate or a batch, so single and multi-candidate
+    prompts share it (and the provider-side prefix cache) unchanged.
+    """
+    return f"""Analyze the candidate(s) below for this job:
+
+JOB: {job_description[:400]}
+REQUIRED: {', '.join(required_skills)}
+"""
 
 class RAGEngine:
     """
     RAG Engine with Gemini integration and Fresher Detection
     """
     
+    # Candidate section of the analysis prompt, appended to _job_prompt_prefix
+    # (label is empty for a single candidate, " 1", " 2", ... in a batch)
+    _CANDIDATE_PROMPT = """
+CANDIDATE{label}:
+Name: {name}
+Type: {candidate_type}
+Graduation Year: {graduation_year}
+Education: {education}
+Skills Matched: {total_matched}/{total_required}
+
+RESUME: {resume}...
+"""
+    
+    _RESPONSE_SCHEMA = """{
+    "overall_score": 0-100,
+    "experience_match_score": 0-100,
+    "qualification_score": 0-100,
+    "cultural_fit_score": 0-100,
+    "strengths": ["2-3 items"],
+    "weaknesses": ["1-2 items"],
+    "ai_summary": "Brief summary",
+    "recommendation": "HIGHLY_RECOMMENDED/RECOMMENDED/MAYBE/NOT_RECOMMENDED",
+    "reasoning": "Why",
+    "suggested_questions": ["2 questions"]
+}"""
+    
     def __init__(self, gemini_api_key: str):
         try:
-            genai.configure(api_key=gemini_api_key)
+            # REST transport: one pooled requests.Session (keep-alive) shared by
+            # every call, and plain sockets that gevent workers can patch
+            genai.configure(api_key=gemini_api_key, transport='rest')
             
             self.llm = genai.GenerativeModel(
                 'gemini-2.0-flash',
@@ -27,15 +344,9 @@ class RAGEngine:
                 }
             )
             
-            # Test API
-            print("🧪 Testing Gemini API...")
-            test_response = self.llm.generate_content("Hi, respond with 'OK'")
-            if test_response and test_response.text:
-                print(f"✅ Gemini API Working! Response: {test_response.text}")
-                self.api_working = True
-            else:
-                print("⚠️  API responded but no text")
-                self.api_working = False
+            # Not probed here - a test round trip would delay every worker's
+            # startup. None = unknown until the first real call settles it.
+            self.api_working = None
             
         except Exception as e:
             print(f"⚠️  Gemini API Error: {e}")
@@ -43,13 +354,26 @@ class RAGEngine:
             self.api_working = False
             self.llm = None
         
-        from daa_algorithms import DAAAlgorithms
         self.daa = DAAAlgorithms()
         
-        print(f"✅ RAG Engine initialized (LLM: {'Active' if self.api_working else 'Disabled'})")
+        print(f"✅ RAG Engine initialized (LLM: {'Active' if self.llm else 'Disabled'})")
     
     def extract_candidate_info(self, resume_text: str) -> Dict[str, Any]:
         """Extract structured candidate information with fresher detection"""
+        info = self._parse_candidate_info(resume_text)
+        return dict(info, education=list(info['education']))
+    
+    def extract_skills_enhanced(self, text: str) -> List[str]:
+        """Enhanced skill extraction"""
+        return list(_scan_lowercase(text)[0])
+    
+    # Parsing depends only on the resume text, so results are memoized per
+    # text: scoring one resume against several jobs (or looking up contact
+    # details for a cache hit) parses it once. Callers get copies.
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _parse_candidate_info(resume_text: str) -> Dict[str, Any]:
         info = {
             'name': 'Unknown',
             'email': None,
@@ -64,89 +388,33 @@ class RAGEngine:
         # Extract Name
         first_lines = resume_text.split('\n')[:5]
         for line in first_lines:
-            name_match = re.search(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})\b', line)
+            name_match = _NAME_RE.search(line)
             if name_match and len(name_match.group(1)) > 5:
                 info['name'] = name_match.group(1).strip()
                 break
         
         # Extract Email
-        email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', resume_text)
+        email_match = _EMAIL_RE.search(resume_text)
         if email_match:
             info['email'] = email_match.group(0)
         
         # Extract Phone
-        phone_patterns = [
-            r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-            r'\b\d{10}\b',
-        ]
-        for pattern in phone_patterns:
-            phone_match = re.search(pattern, resume_text)
-            if phone_match:
-                info['phone'] = phone_match.group(0)
-                break
+        info['phone'] = _find_phone(resume_text)
         
         # Extract Education and Graduation Year
-        education_section = re.search(
-            r'(?:EDUCATION|Education|ACADEMIC|QUALIFICATION)(.*?)(?:EXPERIENCE|SKILLS|PROJECTS|INTERNSHIP|$)',
-            resume_text,
-            re.IGNORECASE | re.DOTALL
-        )
-        
-        graduation_years = []
+        edu_text = _split_sections(resume_text).get('education')
         
-        if education_section:
-            edu_text = education_section.group(1)
-            
+        if edu_text is not None:
             # Extract degrees
-            degrees = re.findall(
-                r'\b(B\.?Tech|B\.?E\.?|M\.?Tech|M\.?E\.?|MBA|MS|PhD|Bachelor|Master|BSc|MSc|BCA|MCA|B\.Sc|M\.Sc)[^\n]{0,100}',
-                edu_text,
-                re.IGNORECASE
-            )
+            degrees = _DEGREE_RE.findall(edu_text)
             info['education'] = [deg.strip() for deg in degrees[:3]]
             
-            # Extract graduation years - MULTIPLE PATTERNS
-            year_patterns = [
-                r'(?:Graduation|Graduated|Passing|Pass\s*out|Completed)[\s:]*(\d{4})',  # "Graduation: 2024"
-                r'(\d{4})\s*[-–—]\s*(\d{4})',  # "2020-2024" (take second year)
-                r'(?:Class\s*of|Batch\s*of)\s*(\d{4})',  # "Class of 2024"
-                r'\b(\d{4})\s*(?:\(|\[)?\s*(?:Expected|Pursuing|Current)?\s*(?:\)|\])?',  # "2024 (Expected)"
-                r'(?:Year|Yr)[\s:]*(\d{4})',  # "Year: 2024"
-            ]
-            
-            for pattern in year_patterns:
-                matches = re.findall(pattern, edu_text, re.IGNORECASE)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        # For range patterns like "2020-2024", take the end year
-                        year = int(match[-1]) if match[-1] else int(match[0])
-                    else:
-                        year = int(match)
-                    
-                    # Only accept years between 2000 and 2030
-                    if 2000 <= year <= 2030:
-                        graduation_years.append(year)
-        
-        # Determine graduation year (most recent)
-        if graduation_years:
-            info['graduation_year'] = max(graduation_years)
+            # Graduation year = most recent year mentioned in the section
+            info['graduation_year'] = max((int(year) for year in _YEAR_RE.findall(edu_text)), default=None)
         
         # Extract Experience Years - ONLY from explicit mentions
-        exp_patterns = [
-            r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)',  # "5 years experience"
-        ]
-        
-        years_found = []
-        for pattern in exp_patterns:
-            matches = re.findall(pattern, resume_text, re.IGNORECASE)
-            for match in matches:
-                try:
-                    years = int(match)
-                    # Only accept reasonable year values (0-50)
-                    if 0 <= years <= 50:
-                        years_found.append(years)
-                except:
-                    pass
+        # Only accept reasonable year values (0-50)
+        years_found = [years for years in _scan_lowercase(resume_text)[1] if 0 <= years <= 50]
         
         if years_found:
             info['experience_years'] = max(years_found)
@@ -185,85 +453,35 @@ class RAGEngine:
         
         return info
     
-    def extract_skills_enhanced(self, text: str) -> List[str]:
-        """Enhanced skill extraction"""
-        text_lower = text.lower()
-        found_skills = set()
-        
-        skill_patterns = {
-            'python': r'\bpython\b',
-            'java': r'\bjava\b(?!script)',
-            'javascript': r'\b(javascript|js)\b',
-            'typescript': r'\btypescript\b',
-            'c++': r'\bc\+\+\b',
-            'c#': r'\bc#\b',
-            'go': r'\b(golang|go)\b',
-            'rust': r'\brust\b',
-            'ruby': r'\bruby\b',
-            'php': r'\bphp\b',
-            'html': r'\bhtml\b',
-            'css': r'\bcss\b',
-            'react': r'\breact\b',
-            'angular': r'\bangular\b',
-            'vue': r'\bvue\b',
-            'node': r'\bnode\b',
-            'express': r'\bexpress\b',
-            'django': r'\bdjango\b',
-            'flask': r'\bflask\b',
-            'spring': r'\bspring\b',
-            'sql': r'\bsql\b',
-            'mysql': r'\bmysql\b',
-            'postgresql': r'\bpostgresql\b',
-            'mongodb': r'\bmongodb\b',
-            'redis': r'\bredis\b',
-            'aws': r'\baws\b',
-            'azure': r'\bazure\b',
-            'gcp': r'\bgcp\b',
-            'docker': r'\bdocker\b',
-            'kubernetes': r'\bkubernetes\b',
-            'jenkins': r'\bjenkins\b',
-            'machine learning': r'\b(machine learning|ml)\b',
-            'deep learning': r'\b(deep learning|dl)\b',
-            'nlp': r'\bnlp\b',
-            'tensorflow': r'\btensorflow\b',
-            'pytorch': r'\bpytorch\b',
-            'git': r'\bgit\b',
-            'github': r'\bgithub\b',
-            'jira': r'\bjira\b',
-            'agile': r'\bagile\b',
-            'rest api': r'\brest\b',
-            'graphql': r'\bgraphql\b',
-            'microservices': r'\bmicroservices\b',
-            'numpy': r'\bnumpy\b',
-            'pandas': r'\bpandas\b',
-            'data structures': r'\bdata structures\b',
-            'problem solving': r'\b(problem solving|problem-solving)\b',
-            'communication skills': r'\b(communication|communication skills)\b',
-        }
-        
-        for skill_name, pattern in skill_patterns.items():
-            if re.search(pattern, text_lower):
-                found_skills.add(skill_name)
-        
-        return list(found_skills)
-    
-    def fuzzy_match_skills(self, resume_skills: List[str], required_skills: List[str]) -> Dict[str, Any]:
+    def fuzzy_match_skills(self, resume_skills: List[str], required_skills: List[str],
+                           resume_text: str = '') -> Dict[str, Any]:
         """Fuzzy skill matching using advanced algorithms"""
         matched_skills = []
         missing_skills = []
         match_details = []
         
         resume_skills_lower = [s.lower().strip() for s in resume_skills]
+        resume_skills_set = set(resume_skills_lower)
+        found_in_text = self._find_skills_in_text(resume_text, required_skills) if resume_text else set()
+        substring_matches = None  # required idx -> resume idx, built on first substring lookup
+        similarities = None  # required × resume score matrix, built on first fuzzy lookup
         
-        for req_skill in required_skills:
+        for idx, req_skill in enumerate(required_skills):
             req_skill_clean = req_skill.lower().strip()
             best_match = None
             best_similarity = 0.0
             match_method = ""
             algorithm_used = ""
             
+            # Exact match in resume text (whole-word str.find per skill)
+            if idx in found_in_text:
+                best_match = req_skill_clean
+                best_similarity = 100.0
+                match_method = "Exact Match"
+                algorithm_used = "Pattern Matching"
+            
             # Exact match
-            if req_skill_clean in resume_skills_lower:
+            if not best_match and req_skill_clean in resume_skills_set:
                 best_match = req_skill_clean
                 best_similarity = 100.0
                 match_method = "Exact Match"
@@ -271,25 +489,30 @@ class RAGEngine:
             
             # Substring match
             if not best_match:
-                for res_skill in resume_skills_lower:
-                    if req_skill_clean in res_skill or res_skill in req_skill_clean:
-                        best_match = res_skill
-                        best_similarity = 95.0
-                        match_method = "Substring Match"
-                        algorithm_used = "String Matching"
-                        break
+                if substring_matches is None:
+                    substring_matches = self._find_substring_matches(resume_skills_lower, required_skills)
+                if idx in substring_matches:
+                    best_match = resume_skills_lower[substring_matches[idx]]
+                    best_similarity = 95.0
+                    match_method = "Substring Match"
+                    algorithm_used = "String Matching"
             
-            # Fuzzy match using similarity algorithms
-            if not best_match:
-                for res_skill in resume_skills_lower:
-                    similarity = self.daa.similarity_score(res_skill, req_skill_clean)
-                    if similarity > best_similarity:
-                        best_similarity = similarity
-                        best_match = res_skill
-                        match_method = f"Fuzzy Match"
-                        algorithm_used = "Similarity Analysis"
+            # Fuzzy match using similarity algorithms (all pairs in one cdist call)
+            if not best_match and resume_skills_lower:
+                if similarities is None:
+                    skills_clean = tuple(s.lower().strip() for s in required_skills)
+                    similarities = np.column_stack([
+                        _skill_similarities(skills_clean, res_skill) for res_skill in resume_skills_lower
+                    ])
+                best_idx = int(similarities[idx].argmax())
+                similarity = round(float(similarities[idx, best_idx]), 2)
+                if similarity > best_similarity:
+                    best_similarity = similarity
+                    best_match = resume_skills_lower[best_idx]
+                    match_method = f"Fuzzy Match"
+                    algorithm_used = "Similarity Analysis"
             
-            if best_similarity >= 60.0:
+            if best_similarity >= SKILL_MATCH_THRESHOLD:
                 matched_skills.append(req_skill)
                 match_details.append({
                     'required': req_skill,
@@ -320,6 +543,47 @@ class RAGEngine:
             'total_missing': len(missing_skills)
         }
     
+    def _find_skills_in_text(self, resume_text: str, required_skills: List[str]) -> set:
+        """
+        Indices of required skills that appear as whole words in the resume
+        
+        One C-level str.find scan per skill: for a handful of skills over a
+        long resume this beats walking the text character by character.
+        """
+        text_lower = _lowercase(resume_text)
+        
+        found = set()
+        for idx, skill in enumerate(s.lower().strip() for s in required_skills):
+            if not skill:
+                continue
+            
+            start = text_lower.find(skill)
+            while start != -1:
+                end = start + len(skill)
+                if (start == 0 or not text_lower[start - 1].isalnum()) and \
+                   (end == len(text_lower) or not text_lower[end].isalnum()):
+                    found.add(idx)
+                    break
+                start = text_lower.find(skill, start + 1)
+        
+        return found
+    
+    def _find_substring_matches(self, resume_skills_lower: List[str],
+                                required_skills: List[str]) -> Dict[int, int]:
+        """
+        First resume skill containing, or contained in, each required skill
+        
+        Returns: {required skill index: resume skill index}
+        """
+        skills_clean = tuple(s.lower().strip() for s in required_skills)
+        matches = {}
+        
+        for res_idx, res_skill in enumerate(resume_skills_lower):
+            for req_idx in _skill_containment(skills_clean, res_skill):
+                matches.setdefault(req_idx, res_idx)
+        
+        return matches
+    
     def analyze_with_rag(self, resume_text: str, job_description: str, 
                          required_skills: List[str]) -> Dict[str, Any]:
         """Comprehensive RAG analysis with fresher detection"""
@@ -342,12 +606,21 @@ class RAGEngine:
         
         # Step 3: Match skills
         print("\n🧮 Running matching algorithms...")
-        match_result = self.fuzzy_match_skills(resume_skills, required_skills)
+        match_result = self.fuzzy_match_skills(resume_skills, required_skills, resume_text)
         print(f"   ✅ Matched: {match_result['total_matched']}/{match_result['total_required']} ({match_result['skill_match_percentage']}%)")
         
+        # Clearly unqualified candidates are settled without a Gemini round trip
+        if self._clearly_unqualified(candidate_info, match_result, job_description):
+            print("\n⏭️  Clearly below requirements - skipping AI analysis")
+            final = self._prescreen_rejection(candidate_info, match_result, resume_skills)
+            print(f"\n{'='*70}")
+            print(f"✅ COMPLETED - Overall: {final['overall_score']}%")
+            print(f"{'='*70}\n")
+            return final
+        
         # Step 4: LLM Analysis
         llm_analysis = None
-        if self.api_working and self.llm:
+        if self.api_working is not False and self.llm:
             print("\n🤖 Running AI analysis...")
             try:
                 llm_analysis = self._try_llm_analysis(
@@ -371,63 +644,212 @@ class RAGEngine:
         
         return final
     
+    def analyze_batch(self, resume_texts: List[str], job_description: str,
+                      required_skills: List[str], max_workers: int = 8) -> List[Dict[str, Any]]:
+        """
+        Analyze several resumes for one job, packing candidates into shared LLM requests
+        
+        Extraction and matching run per resume as in analyze_with_rag. The LLM
+        step sends LLM_BATCH_SIZE candidates per prompt, with the chunk requests
+        in flight concurrently, so N resumes cost N / LLM_BATCH_SIZE round trips.
+        Candidates without a usable LLM answer get algorithmic scoring.
+        
+        Returns: one analysis per resume, in input order
+        """
+        print(f"\n🔍 BATCH ANALYSIS - {len(resume_texts)} resumes")
+        
+        # Matching stays in-process: ~1 ms per resume with the per-job caches,
+        # next to a Gemini round trip of seconds
+        prepared = [(resume_text, *self._match_resume(resume_text, required_skills))
+                    for resume_text in resume_texts]
+        
+        # Clearly unqualified candidates are left out of the LLM requests
+        rejected = [
+            self._clearly_unqualified(candidate_info, match_result, job_description)
+            for _, candidate_info, _, match_result in prepared
+        ]
+        to_score = [i for i, is_rejected in enumerate(rejected) if not is_rejected]
+        
+        llm_analyses = [None] * len(prepared)
+        if to_score and self.api_working is not False and self.llm:
+            candidates = [
+                (resume_text, candidate_info, match_result)
+                for (resume_text, candidate_info, _, match_result), is_rejected in zip(prepared, rejected)
+                if not is_rejected
+            ]
+            chunks = [candidates[i:i + LLM_BATCH_SIZE] for i in range(0, len(candidates), LLM_BATCH_SIZE)]
+            print(f"🤖 Running AI analysis ({len(chunks)} requests, {len(prepared) - len(to_score)} skipped)...")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                chunk_analyses = list(executor.map(
+                    lambda chunk: self._try_llm_batch_analysis(chunk, job_description, required_skills),
+                    chunks
+                ))
+            for i, analysis in zip(to_score, (analysis for analyses in chunk_analyses for analysis in analyses)):
+                llm_analyses[i] = analysis
+        
+        results = []
+        for (_, candidate_info, resume_skills, match_result), llm_analysis, is_rejected in zip(prepared, llm_analyses, rejected):
+            if is_rejected:
+                results.append(self._prescreen_rejection(candidate_info, match_result, resume_skills))
+            elif llm_analysis:
+                results.append(self._merge_analysis(candidate_info, match_result, llm_analysis, resume_skills))
+            else:
+                results.append(self._smart_algorithmic_scoring(candidate_info, match_result, resume_skills))
+        
+        print(f"✅ BATCH COMPLETED - {sum(1 for analysis in llm_analyses if analysis)}/{len(results)} AI-scored\n")
+        return results
+    
+    def _clearly_unqualified(self, candidate_info: Dict, match_result: Dict,
+                             job_description: str) -> bool:
+        """
+        Cheap pre-screen run before any LLM call
+        
+        A candidate with almost none of the required skills and no
+        experience, applying to a senior role, cannot be rescued by the
+        LLM's judgement. A job without required skills scores 0% but sets
+        no skill bar, so it never pre-screens anyone out.
+        """
+        return (match_result['total_required'] > 0
+                and match_result['skill_match_percentage'] < PRESCREEN_SKILL_MATCH
+                and candidate_info['experience_years'] == 0
+                and _is_senior_role(job_description))
+    
+    def _prescreen_rejection(self, candidate_info: Dict, match_result: Dict,
+                             resume_skills: List[str]) -> Dict:
+        """Algorithmic result for a pre-screened candidate, marked NOT_RECOMMENDED"""
+        result = self._smart_algorithmic_scoring(candidate_info, match_result, resume_skills)
+        result['recommendation'] = "NOT_RECOMMENDED"
+        result['reasoning'] = (f"Below requirements for a senior role: {match_result['skill_match_percentage']:.1f}% "
+                               f"skill match and no professional experience")
+        result['ai_summary'] = (f"{candidate_info['name']} - {candidate_info['candidate_type']}. "
+                                f"{match_result['skill_match_percentage']:.1f}% skill match. NOT RECOMMENDED.")
+        return result
+    
+    def _match_resume(self, resume_text: str, required_skills: List[str]) -> Tuple[Dict, List[str], Dict]:
+        """Candidate info, resume skills and skill match for one resume"""
+        candidate_info = self.extract_candidate_info(resume_text)
+        resume_skills = self.extract_skills_enhanced(resume_text)
+        match_result = self.fuzzy_match_skills(resume_skills, required_skills, resume_text)
+        return candidate_info, resume_skills, match_result
+    
     def _try_llm_analysis(self, resume_text: str, job_description: str,
                          candidate_info: Dict, match_result: Dict,
                          required_skills: List[str]) -> Dict:
         """Try LLM analysis"""
+        # Job prefix first and identical across candidates, so the
+        # provider-side prompt prefix cache can reuse it
+        prompt = _job_prompt_prefix(job_description, tuple(required_skills)) + \
+            self._candidate_prompt(resume_text, candidate_info, match_result) + \
+            "\nJSON response:\n" + self._RESPONSE_SCHEMA
+        
+        text = self._generate(prompt)
+        return self._parse_llm_response(text) if text else None
+    
+    def _try_llm_batch_analysis(self, candidates: List[Tuple], job_description: str,
+                                required_skills: List[str]) -> List[Dict]:
+        """
+        LLM analysis of several candidates in one request
+        
+        candidates: (resume_text, candidate_info, match_result) tuples
+        
+        Returns: one analysis (or None) per candidate, in order
+        """
+        if len(candidates) == 1:
+            resume_text, candidate_info, match_result = candidates[0]
+            return [self._try_llm_analysis(resume_text, job_description, candidate_info,
+                                           match_result, required_skills)]
+        
+        prompt = _job_prompt_prefix(job_description, tuple(required_skills)) + \
+            "".join(self._candidate_prompt(*candidate, label=f" {number}")
+                    for number, candidate in enumerate(candidates, 1)) + \
+            f"\nJSON response: an array of {len(candidates)} objects, one per candidate " \
+            f"in the order above, each:\n" + self._RESPONSE_SCHEMA
+        
+        # JSON mode keeps prose out of the reply, and the output budget grows
+        # with the chunk so the last objects are not cut off
+        text = self._generate(prompt, {
+            'response_mime_type': 'application/json',
+            'max_output_tokens': LLM_TOKENS_PER_CANDIDATE * len(candidates),
+        })
+        analyses = self._parse_llm_batch_response(text, len(candidates)) if text else None
+        return analyses or [None] * len(candidates)
+    
+    def _candidate_prompt(self, resume_text: str, candidate_info: Dict,
+                          match_result: Dict, label: str = '') -> str:
+        return self._CANDIDATE_PROMPT.format_map({
+            'label': label,
+            'name': candidate_info['name'],
+            'candidate_type': candidate_info['candidate_type'],
+            'graduation_year': candidate_info.get('graduation_year', 'Not specified'),
+            'education': ', '.join(candidate_info['education'][:2]),
+            'total_matched': match_result['total_matched'],
+            'total_required': match_result['total_required'],
+            'resume': resume_text[:800],
+        })
+    
+    def _generate(self, prompt: str, generation_config: Optional[Dict] = None) -> str:
+        """Response text from Gemini, or None if the call failed"""
         try:
-            prompt = f"""Analyze this candidate:
-
-JOB: {job_description[:400]}
-REQUIRED: {', '.join(required_skills)}
-
-CANDIDATE:
-Name: {candidate_info['name']}
-Type: {candidate_info['candidate_type']}
-Graduation Year: {candidate_info.get('graduation_year', 'Not specified')}
-Education: {', '.join(candidate_info['education'][:2])}
-Skills Matched: {match_result['total_matched']}/{match_result['total_required']}
-
-RESUME: {resume_text[:800]}...
-
-JSON response:
-{{
-    "overall_score": 0-100,
-    "experience_match_score": 0-100,
-    "qualification_score": 0-100,
-    "cultural_fit_score": 0-100,
-    "strengths": ["2-3 items"],
-    "weaknesses": ["1-2 items"],
-    "ai_summary": "Brief summary",
-    "recommendation": "HIGHLY_RECOMMENDED/RECOMMENDED/MAYBE/NOT_RECOMMENDED",
-    "reasoning": "Why",
-    "suggested_questions": ["2 questions"]
-}}"""
-            
-            response = self.llm.generate_content(prompt)
+            # Per-call settings are merged over the model's generation_config
+            response = self.llm.generate_content(prompt, generation_config=generation_config)
             
             if response and response.text:
-                return self._parse_llm_response(response.text)
+                if self.api_working is None:
+                    print("✅ Gemini API Working!")
+                    self.api_working = True
+                return response.text
             
         except Exception as e:
             print(f"   LLM error: {e}")
+            # First call failed outright (bad key, no access) - stop trying
+            if self.api_working is None:
+                print("⚠️  Will use algorithmic analysis only")
+                self.api_working = False
         
         return None
     
     def _parse_llm_response(self, text: str) -> Dict:
         """Parse JSON from LLM"""
         try:
-            json_match = re.search(r'```(?:json)?\s*(.*?)\s*```', text, re.DOTALL)
+            json_match = _CODE_BLOCK_RE.search(text)
             if json_match:
                 json_str = json_match.group(1)
             else:
-                json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', text, re.DOTALL)
-                json_str = json_match.group(0) if json_match else text
+                json_str = _find_json(text) or text
             
             return json.loads(json_str)
         except:
             return None
     
+    def _parse_llm_batch_response(self, text: str, count: int) -> List[Dict]:
+        """
+        Parse a JSON array of `count` analyses from LLM
+        
+        Prose around the array can hold bracket spans of its own
+        ("candidates [1]-[5]:"), so each balanced [...] span is tried in
+        turn until one is the expected array.
+        """
+        json_match = _CODE_BLOCK_RE.search(text)
+        rest = json_match.group(1) if json_match else text
+        
+        # JSON mode replies are the bare array, so try the whole text first
+        span = rest
+        while span is not None:
+            try:
+                analyses = json.loads(span)
+            except Exception:  # Malformed, or nested deeper than the decoder allows
+                analyses = None
+            
+            if isinstance(analyses, list) and len(analyses) == count and \
+               all(isinstance(analysis, dict) for analysis in analyses):
+                return analyses
+            
+            span = _find_json(rest, '[')
+            if span is not None:
+                rest = rest[rest.index(span) + len(span):]
+        
+        return None
+    
     def _merge_analysis(self, candidate_info: Dict, match_result: Dict,
                        llm_analysis: Dict, resume_skills: List[str]) -> Dict:
         """Merge LLM with algorithmic results"""
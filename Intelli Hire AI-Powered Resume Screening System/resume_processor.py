@@ -1,27 +1,122 @@
 import fitz
-from docx import Document
-import io
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List
+from xml.etree import ElementTree
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+
+SPOOL_CHUNK_SIZE = 1024 * 1024  # Copy uploads to disk 1MB at a time
+
+# Plain-text extraction with ligatures expanded, so "ﬂask" or "proﬁcient"
+# from LaTeX/Word PDFs reach the skill patterns as ordinary letters
+PDF_TEXT_FLAGS = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_LIGATURES
+
+# WordprocessingML run content, read straight from word/document.xml
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_RUN_SYMBOLS = {_W + 'tab': '\t', _W + 'ptab': '\t', _W + 'cr': '\n', _W + 'noBreakHyphen': '-'}
+
+def _parse_workers() -> int:
+    """
+    Parse processes for this server process: PARSE_WORKERS if set, else
+    the cores split between the WEB_CONCURRENCY Gunicorn workers, since
+    each worker runs its own pool
+    """
+    return int(os.getenv('PARSE_WORKERS', 0)) or \
+        max(1, os.cpu_count() // int(os.getenv('WEB_CONCURRENCY', 1)))
+
+def _parse_context():
+    """
+    Start method for the parse pool: the platform default (fork on Linux,
+    so workers share the modules already loaded) unless gevent has patched
+    os. Gevent-forked workers inherit each other's liveness pipes, so a
+    crashed worker is never noticed and the batch waits forever; those
+    workers come from a forkserver that preloads only this module
+    """
+    gevent_monkey = sys.modules.get('gevent.monkey')
+    if gevent_monkey is None or not gevent_monkey.is_module_patched('os'):
+        return multiprocessing.get_context()
+    
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(['resume_processor'])
+    return context
+
+def _extract_text_from_path(filename: str, path: str) -> str:
+    """Worker entry point: extract text from an upload spooled to disk"""
+    if filename.lower().endswith('.pdf'):
+        return ResumeProcessor().extract_text_from_pdf(path)
+    
+    with open(path, 'rb') as file:
+        file.filename = filename
+        return ResumeProcessor().extract_text(file)
 
 class ResumeProcessor:
+    _executor = None  # Shared process pool, created on first batch
+    
     def extract_text_from_pdf(self, file) -> str:
+        """Text of a PDF given as a file object or as a path on disk"""
         try:
-            pdf_bytes = file.read()
-            pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
-            text = ""
-            for page in pdf_document:
-                text += page.get_text()
-            pdf_document.close()
-            return text
+            if isinstance(file, str):
+                # Opened in place: MuPDF reads pages from disk as needed
+                # instead of holding a full bytes copy of the upload
+                pdf_document = fitz.open(file, filetype="pdf")
+            else:
+                pdf_document = fitz.open(stream=file.read(), filetype="pdf")
+            
+            with pdf_document:
+                return "\n".join(page.get_text("text", flags=PDF_TEXT_FLAGS) for page in pdf_document)
         except Exception as e:
             return ""
     
     def extract_text_from_docx(self, file) -> str:
+        """
+        Body paragraph text of a .docx, one line per paragraph
+        
+        Parses only word/document.xml with the C XML parser instead of
+        loading the whole package into python-docx's object model; the
+        text matches python-docx's Document.paragraphs / Paragraph.text.
+        """
         try:
-            doc = Document(io.BytesIO(file.read()))
-            return "\n".join([para.text for para in doc.paragraphs])
+            with zipfile.ZipFile(file) as docx:
+                root = ElementTree.fromstring(docx.read('word/document.xml'))
+            
+            body = root.find(_W + 'body')
+            return "\n".join(self._paragraph_text(para) for para in body.iterfind(_W + 'p'))
         except Exception as e:
             return ""
     
+    def _paragraph_text(self, para) -> str:
+        parts = []
+        
+        # Runs directly in the paragraph or inside a hyperlink, in order
+        for child in para:
+            if child.tag == _W + 'r':
+                runs = [child]
+            elif child.tag == _W + 'hyperlink':
+                runs = child.iterfind(_W + 'r')
+            else:
+                continue
+            
+            for run in runs:
+                for item in run:
+                    if item.tag == _W + 't':
+                        parts.append(item.text or '')
+                    elif item.tag == _W + 'br':
+                        # Line breaks only; page and column breaks add no text
+                        if item.get(_W + 'type', 'textWrapping') == 'textWrapping':
+                            parts.append('\n')
+                    elif item.tag in _RUN_SYMBOLS:
+                        parts.append(_RUN_SYMBOLS[item.tag])
+        
+        return ''.join(parts)
+    
     def extract_text(self, file) -> str:
         filename = file.filename.lower()
         file.seek(0)
@@ -30,4 +125,72 @@ class ResumeProcessor:
             return self.extract_text_from_pdf(file)
         elif filename.endswith('.docx'):
             return self.extract_text_from_docx(file)
-        return ""
\ No newline at end of file
+        return ""
+    
+    def extract_texts(self, files) -> List[str]:
+        """
+        Extract text from many uploads in parallel
+        
+        Parsing is CPU-bound and holds the GIL, so a batch is spread over
+        a process pool (one worker per core). Results keep input order.
+        
+        Uploads are streamed to temp files and closed before parsing, so
+        only the files being parsed are ever in memory, not the batch.
+        PDFs are then opened from those files rather than read into bytes.
+        """
+        filenames = [file.filename for file in files]
+        paths = []
+        
+        try:
+            for file in files:
+                paths.append(self._spool_to_disk(file))
+            
+            if len(paths) < 2:
+                return [_extract_text_from_path(filename, path) for filename, path in zip(filenames, paths)]
+            
+            pool = self._pool()
+            try:
+                return list(pool.map(_extract_text_from_path, filenames, paths))
+            except BrokenProcessPool:
+                self._discard_pool(pool)
+            
+            # A worker died mid-batch (MuPDF crash, OOM kill). Redo the files
+            # one at a time so only the file that kills a worker is lost
+            texts = []
+            for filename, path in zip(filenames, paths):
+                pool = self._pool()
+                try:
+                    texts.append(pool.submit(_extract_text_from_path, filename, path).result())
+                except BrokenProcessPool:
+                    print(f"⚠️  {filename}: parser process died - skipping file")
+                    self._discard_pool(pool)
+                    texts.append("")
+            return texts
+        finally:
+            for path in paths:
+                os.remove(path)
+    
+    @staticmethod
+    def _pool() -> ProcessPoolExecutor:
+        if ResumeProcessor._executor is None:
+            ResumeProcessor._executor = ProcessPoolExecutor(max_workers=_parse_workers(), mp_context=_parse_context())
+        return ResumeProcessor._executor
+    
+    @staticmethod
+    def _discard_pool(pool: ProcessPoolExecutor) -> None:
+        """Drop a broken pool so the next batch starts a fresh one"""
+        # Let it finish terminating its workers before a new pool starts
+        pool.shutdown(wait=True, cancel_futures=True)
+        if ResumeProcessor._executor is pool:
+            ResumeProcessor._executor = None
+    
+    def _spool_to_disk(self, file) -> str:
+        """Copy an upload to a temp file in chunks and release the upload"""
+        file.seek(0)
+        suffix = os.path.splitext(file.filename)[1]
+        
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as spool:
+            shutil.copyfileobj(file.stream, spool, SPOOL_CHUNK_SIZE)
+        
+        file.close()
+        return spool.name
\ No newline at end of file
@@ -0,0 +1,16 @@
+# ============================================================================
+# WSGI ENTRYPOINT - Production server (Gunicorn + gevent workers)
+# ============================================================================
+#
+#   WEB_CONCURRENCY=$(nproc) gunicorn -k gevent --worker-connections 200 wsgi:app
+#
+# Gemini and Supabase calls are network-bound, so each gevent worker
+# multiplexes many requests over greenlets instead of blocking on one.
+# CPU-heavy PDF parsing already runs in ResumeProcessor's process pool;
+# Gunicorn takes its worker count from WEB_CONCURRENCY, and each worker's
+# pool gets an equal share of the cores (override with PARSE_WORKERS).
+
+from gevent import monkey
+monkey.patch_all()  # Must run before socket/ssl/threading are imported
+
+from app import app  # noqa: E402